@@ -1,7 +1,9 @@
 from flask import Flask, jsonify
 from flask_cors import CORS
 from app.db import init_db
-from app.routes import seminars, members, talks, attendance
+from app.admission import default_admission_routes, admission_stats
+from app.middleware import require_admin
+from app.routes import seminars, members, talks, attendance, uploads
 import os
 
 def create_app():
@@ -9,7 +11,16 @@ def create_app():
 
     app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URL')
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config['DATABASE_REPLICA_URL'] = os.getenv('DATABASE_REPLICA_URL')
+    app.config['REPLICA_READ_YOUR_WRITES_SECONDS'] = float(os.getenv('REPLICA_READ_YOUR_WRITES_SECONDS', 5))
+    app.config['REPLICA_MAX_LAG_SECONDS'] = float(os.getenv('REPLICA_MAX_LAG_SECONDS', 10))
+    app.config['REPLICA_LAG_CHECK_INTERVAL'] = float(os.getenv('REPLICA_LAG_CHECK_INTERVAL', 5))
     app.config['MAX_CONTENT_LENGTH'] = 50 * 1024 * 1024
+    app.config['USE_X_SENDFILE'] = os.getenv('USE_X_SENDFILE', 'false').lower() == 'true'
+    app.config['ADMISSION_ENABLED'] = os.getenv('ADMISSION_ENABLED', 'true').lower() == 'true'
+    app.config['ADMISSION_ROUTES'] = default_admission_routes()
+    app.config['ATTENDANCE_INDEX_TTL'] = float(os.getenv('ATTENDANCE_INDEX_TTL', 30))
+    app.config['COMPRESSION_MIN_SIZE'] = int(os.getenv('COMPRESSION_MIN_SIZE', 1024))
 
     CORS(app, origins=['*'], supports_credentials=True)
 
@@ -19,9 +30,15 @@ def create_app():
     def health():
         return jsonify({'ok': True}), 200
 
+    @app.route('/api/admission/stats', methods=['GET'])
+    @require_admin
+    def get_admission_stats():
+        return jsonify(admission_stats()), 200
+
     app.register_blueprint(seminars.bp)
     app.register_blueprint(members.bp)
     app.register_blueprint(talks.bp)
     app.register_blueprint(attendance.bp)
+    app.register_blueprint(uploads.bp)
 
     return app
\ No newline at end of file
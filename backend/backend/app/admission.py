@@ -0,0 +1,153 @@
+import math
+import os
+import threading
+import time
+from functools import wraps
+from flask import current_app, jsonify
+from app.middleware import is_admin_request
+
+def default_admission_routes():
+    return {
+        'sign_in': {
+            'max_concurrency': int(os.getenv('SIGN_IN_MAX_CONCURRENCY', 4)),
+            'max_queue': int(os.getenv('SIGN_IN_MAX_QUEUE', 2)),
+            'queue_timeout': float(os.getenv('SIGN_IN_QUEUE_TIMEOUT', 0.5)),
+            'rate': float(os.getenv('SIGN_IN_RATE', 50)),
+            'burst': int(os.getenv('SIGN_IN_BURST', 100)),
+        },
+    }
+
+class TokenBucket:
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def take(self):
+        """Take one token. Returns 0 on success, otherwise seconds until one is available."""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0
+
+            return (1 - self.tokens) / self.rate
+
+class ConcurrencyLimiter:
+    def __init__(self, max_concurrency, max_queue, queue_timeout):
+        self.semaphore = threading.BoundedSemaphore(max_concurrency)
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.waiting = 0
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Returns (admitted, queued). Never waits longer than queue_timeout."""
+        if self.semaphore.acquire(blocking=False):
+            return True, False
+
+        with self.lock:
+            if self.waiting >= self.max_queue:
+                return False, False
+            self.waiting += 1
+
+        try:
+            return self.semaphore.acquire(timeout=self.queue_timeout), True
+        finally:
+            with self.lock:
+                self.waiting -= 1
+
+    def release(self):
+        self.semaphore.release()
+
+class RouteLimiter:
+    def __init__(self, name, max_concurrency, max_queue, queue_timeout, rate, burst):
+        self.name = name
+        self.bucket = TokenBucket(rate, burst) if rate > 0 else None
+        self.concurrency = ConcurrencyLimiter(max_concurrency, max_queue, queue_timeout) if max_concurrency > 0 else None
+        self.lock = threading.Lock()
+        self.counters = {
+            'admitted': 0,
+            'queued': 0,
+            'shed_rate_limited': 0,
+            'shed_overloaded': 0,
+            'in_flight': 0,
+        }
+
+    def count(self, key, delta=1):
+        with self.lock:
+            self.counters[key] += delta
+
+    def stats(self):
+        with self.lock:
+            stats = dict(self.counters)
+        stats['waiting'] = self.concurrency.waiting if self.concurrency else 0
+        return stats
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+def get_limiter(name):
+    limiter = _limiters.get(name)
+    if limiter:
+        return limiter
+
+    with _limiters_lock:
+        if name not in _limiters:
+            config = current_app.config['ADMISSION_ROUTES'][name]
+            _limiters[name] = RouteLimiter(name, **config)
+        return _limiters[name]
+
+def admission_stats():
+    with _limiters_lock:
+        limiters = list(_limiters.values())
+    return {limiter.name: limiter.stats() for limiter in limiters}
+
+def shed(error, status, retry_after):
+    response = jsonify({'error': error})
+    response.status_code = status
+    response.headers['Retry-After'] = str(max(1, math.ceil(retry_after)))
+    return response
+
+def admission_control(name):
+    """Rate and concurrency limit a route, shedding excess load with 429/503 instead of queuing on the DB."""
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            # Admins can still sign members in during a rush
+            if not current_app.config.get('ADMISSION_ENABLED', True) or is_admin_request():
+                return f(*args, **kwargs)
+
+            limiter = get_limiter(name)
+
+            if limiter.bucket:
+                wait = limiter.bucket.take()
+                if wait:
+                    limiter.count('shed_rate_limited')
+                    return shed('Too many requests, please retry shortly', 429, wait)
+
+            if not limiter.concurrency:
+                limiter.count('admitted')
+                return f(*args, **kwargs)
+
+            admitted, queued = limiter.concurrency.acquire()
+            if queued:
+                limiter.count('queued')
+            if not admitted:
+                limiter.count('shed_overloaded')
+                return shed('Server busy, please retry shortly', 503, 1)
+
+            limiter.count('admitted')
+            limiter.count('in_flight')
+            try:
+                return f(*args, **kwargs)
+            finally:
+                limiter.count('in_flight', -1)
+                limiter.concurrency.release()
+        return decorated_function
+    return decorator
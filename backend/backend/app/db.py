@@ -1,9 +1,123 @@
+import threading
+import time
+from urllib.parse import urlsplit
+from functools import wraps
+from flask import current_app, g, request
 from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session
 from flask_migrate import Migrate
+import sqlalchemy as sa
 
-db = SQLAlchemy()
+REPLICA_BIND = 'replica'
+LAST_WRITE_COOKIE = 'last_write'
+WRITE_METHODS = {'POST', 'PUT', 'PATCH', 'DELETE'}
+
+class RoutingSession(Session):
+    """Sends reads from @read_replica routes to the replica; everything else goes to the primary."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (
+            bind is None
+            and g.get('use_replica')
+            and not self._flushing
+            and not isinstance(clause, sa.UpdateBase)
+        ):
+            return self._db.engines[REPLICA_BIND]
+
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 migrate = Migrate()
 
+_replica_lag = {'checked_at': 0.0, 'lag': None}
+_replica_lag_lock = threading.Lock()
+
 def init_db(app):
+    replica_url = app.config.get('DATABASE_REPLICA_URL')
+    if replica_url:
+        app.config.setdefault('SQLALCHEMY_BINDS', {})[REPLICA_BIND] = replica_url
+
     db.init_app(app)
     migrate.init_app(app, db)
+
+    @app.after_request
+    def remember_write(response):
+        if (
+            replica_url
+            and request.method in WRITE_METHODS
+            and response.status_code < 400
+        ):
+            window = app.config['REPLICA_READ_YOUR_WRITES_SECONDS']
+            # Cross-site frontends only send the cookie back if it is SameSite=None, which browsers require to be Secure
+            cross_site = bool(request.origin) and urlsplit(request.origin).netloc != request.host
+            response.set_cookie(
+                LAST_WRITE_COOKIE,
+                str(time.time()),
+                max_age=int(window) + 1,
+                httponly=True,
+                samesite='None' if cross_site else 'Lax',
+                secure=cross_site or request.is_secure
+            )
+        return response
+
+def replica_lag():
+    """Replication lag in seconds, cached for REPLICA_LAG_CHECK_INTERVAL. None if the replica is unreachable."""
+    interval = current_app.config['REPLICA_LAG_CHECK_INTERVAL']
+    now = time.monotonic()
+
+    if now - _replica_lag['checked_at'] < interval:
+        return _replica_lag['lag']
+
+    with _replica_lag_lock:
+        if now - _replica_lag['checked_at'] < interval:
+            return _replica_lag['lag']
+
+        engine = db.engines[REPLICA_BIND]
+        try:
+            with engine.connect() as connection:
+                if engine.dialect.name == 'postgresql':
+                    # The replay timestamp only means lag while WAL is still waiting to be replayed;
+                    # on a quiet primary it just grows with the time since the last write
+                    lag = connection.execute(sa.text(
+                        'SELECT CASE '
+                        'WHEN NOT pg_is_in_recovery() THEN 0 '
+                        'WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 '
+                        'ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) '
+                        'END'
+                    )).scalar()
+                else:
+                    connection.execute(sa.text('SELECT 1'))
+                    lag = 0
+            lag = float(lag)
+        except sa.exc.SQLAlchemyError:
+            current_app.logger.warning('Read replica unreachable, falling back to primary')
+            lag = None
+
+        _replica_lag['checked_at'] = now
+        _replica_lag['lag'] = lag
+        return lag
+
+def recently_wrote():
+    try:
+        last_write = float(request.cookies.get(LAST_WRITE_COOKIE, 0))
+    except ValueError:
+        return False
+
+    return time.time() - last_write < current_app.config['REPLICA_READ_YOUR_WRITES_SECONDS']
+
+def should_use_replica():
+    if REPLICA_BIND not in current_app.config.get('SQLALCHEMY_BINDS', {}):
+        return False
+
+    if recently_wrote():
+        return False
+
+    lag = replica_lag()
+    return lag is not None and lag <= current_app.config['REPLICA_MAX_LAG_SECONDS']
+
+def read_replica(f):
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        g.use_replica = should_use_replica()
+        return f(*args, **kwargs)
+    return decorated_function
@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, UniqueConstraint, Index, LargeBinary
 from sqlalchemy.orm import relationship
 from app.db import db
 
@@ -75,7 +75,32 @@ class Attendance(db.Model):
 
     __table_args__ = (
         UniqueConstraint('member_id', 'seminar_id', 'day', name='unique_member_day_attendance'),
+        Index('ix_attendances_seminar_day', 'seminar_id', 'day'),
     )
 
     seminar = relationship('Seminar', back_populates='attendances')
     member = relationship('Member', back_populates='attendances')
+
+class AttendanceArchive(db.Model):
+    """Attendance rows of closed seminars, moved out of the hot attendances table."""
+    __tablename__ = 'attendance_archive'
+
+    id = Column(Integer, primary_key=True)
+    seminar_id = Column(Integer, ForeignKey('seminars.id'), nullable=False, index=True)
+    day = Column(Integer, nullable=False)
+    member_id = Column(Integer, ForeignKey('members.id'), nullable=False)
+    created_at = Column(DateTime)
+    ip_address = Column(String(45))
+    location = Column(String(255))
+
+    member = relationship('Member')
+
+class AttendanceSnapshot(db.Model):
+    """Frozen attendance matrix of a closed seminar (zlib-compressed JSON)."""
+    __tablename__ = 'attendance_snapshots'
+
+    seminar_id = Column(Integer, ForeignKey('seminars.id'), primary_key=True)
+    number_of_days = Column(Integer, nullable=False)
+    member_count = Column(Integer, nullable=False)
+    data = Column(LargeBinary, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
@@ -1,34 +1,52 @@
+from datetime import datetime, timedelta
 from flask import Blueprint, request, jsonify, send_file
-from app.models import Attendance, Member, Seminar
+from app.models import Attendance, AttendanceArchive, AttendanceSnapshot, Member, Seminar
 from app.schemas import AttendanceSchema, SignInSchema
-from app.db import db
+from app.db import db, read_replica
 from app.middleware import require_admin
-from app.utils.csv_import import export_attendance_to_excel
+from app.admission import admission_control
+from app.utils.csv_import import export_attendance_to_excel, attendance_matrix_to_excel
+from app.utils.archive import is_archived, attendance_model_for, snapshot_matrix
+from app.utils.attendance_index import record_attendance
+from app.utils.responses import list_response
+from app.utils.export_cache import export_cache_key, send_cached_export, send_export, store_export
+from app.utils.analytics_export import EXPORT_FORMATS, attendance_history_query, write_attendance_history
 from marshmallow import ValidationError
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload
 
 bp = Blueprint('attendance', __name__)
 attendance_schema = AttendanceSchema()
-attendances_schema = AttendanceSchema(many=True)
 signin_schema = SignInSchema()
 
 @bp.route('/api/attendance', methods=['GET'])
+@read_replica
 def get_attendance():
     seminar_id = request.args.get('seminarId')
     day = request.args.get('day')
 
-    query = Attendance.query
-
+    # Closed seminars live in the archive table; unscoped listings cover both
+    models = [Attendance, AttendanceArchive]
     if seminar_id:
-        query = query.filter_by(seminar_id=seminar_id)
+        seminar = Seminar.query.filter_by(id=seminar_id).first()
+        models = [attendance_model_for(seminar)] if seminar else [Attendance]
+
+    queries = []
+    for model in models:
+        query = model.query.options(joinedload(model.member))
+
+        if seminar_id:
+            query = query.filter_by(seminar_id=seminar_id)
+
+        if day:
+            query = query.filter_by(day=day)
 
-    if day:
-        query = query.filter_by(day=day)
+        queries.append(query)
 
-    attendance_records = query.all()
-    return jsonify(attendances_schema.dump(attendance_records)), 200
+    return list_response(queries, attendance_schema)
 
 @bp.route('/api/attendance/sign-in', methods=['POST'])
+@admission_control('sign_in')
 def sign_in():
     try:
         data = signin_schema.load(request.json)
@@ -44,6 +62,11 @@ def sign_in():
         return jsonify({'error': 'Member not found'}), 404
 
     seminar = Seminar.query.get_or_404(seminar_id)
+    if is_archived(seminar):
+        return jsonify({'error': 'Seminar is closed'}), 409
+
+    if not 1 <= day <= seminar.number_of_days:
+        return jsonify({'error': f'Day must be between 1 and {seminar.number_of_days}'}), 400
 
     existing = Attendance.query.filter_by(
         member_id=member.id,
@@ -72,37 +95,77 @@ def sign_in():
         db.session.rollback()
         return jsonify({'error': 'Already signed in for this day'}), 409
 
+    record_attendance(seminar.id, member.id, [day])
+
     return jsonify(attendance_schema.dump(attendance)), 201
 
 @bp.route('/api/attendance/export', methods=['GET'])
 @require_admin
+@read_replica
 def export_attendance():
     seminar_id = request.args.get('seminarId')
+    export_format = request.args.get('format', 'xlsx')
+
+    if export_format != 'xlsx':
+        return export_attendance_history(export_format)
 
     if not seminar_id:
         return jsonify({'error': 'seminarId is required'}), 400
 
     seminar = Seminar.query.get_or_404(seminar_id)
+    download_name = f'{seminar.title}_attendance.xlsx'
+
+    # Re-render only when the seminar or its attendance changed
+    cache_key = export_cache_key(seminar)
+    cached = send_cached_export(cache_key, download_name)
+    if cached:
+        return cached
 
-    # Get all registered members for this seminar
-    member_ids = db.session.query(Attendance.member_id).filter(
-        Attendance.seminar_id == seminar_id
-    ).distinct().all()
-    member_ids = [m[0] for m in member_ids if m[0]]
+    if is_archived(seminar):
+        snapshot = AttendanceSnapshot.query.get(seminar.id)
+        if not snapshot or not snapshot.member_count:
+            return jsonify({'error': 'No registered members found'}), 404
 
-    if not member_ids:
-        return jsonify({'error': 'No registered members found'}), 404
+        excel_file = attendance_matrix_to_excel(snapshot.number_of_days, snapshot_matrix(snapshot))
+    else:
+        # Get all registered members for this seminar
+        member_ids = db.session.query(Attendance.member_id).filter(
+            Attendance.seminar_id == seminar_id
+        ).distinct().all()
+        member_ids = [m[0] for m in member_ids if m[0]]
 
-    registered_members = Member.query.filter(Member.id.in_(member_ids)).all()
+        if not member_ids:
+            return jsonify({'error': 'No registered members found'}), 404
 
-    # Get all attendance records for this seminar
-    attendance_records = Attendance.query.filter_by(seminar_id=seminar_id).all()
+        registered_members = Member.query.filter(Member.id.in_(member_ids)).all()
+
+        # Get all attendance records for this seminar
+        attendance_records = Attendance.query.filter_by(seminar_id=seminar_id).all()
+
+        excel_file = export_attendance_to_excel(seminar, registered_members, attendance_records)
+
+    store_export(cache_key, excel_file)
+
+    return send_export(excel_file, cache_key, download_name)
+
+def export_attendance_history(export_format):
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({'error': f'format must be one of: xlsx, {", ".join(EXPORT_FORMATS)}'}), 400
+
+    try:
+        seminar_ids = [int(i) for i in request.args.get('seminarId', '').split(',') if i]
+        start = request.args.get('from')
+        start = datetime.strptime(start, '%Y-%m-%d') if start else None
+        end = request.args.get('to')
+        end = datetime.strptime(end, '%Y-%m-%d') + timedelta(days=1) if end else None
+    except ValueError:
+        return jsonify({'error': 'seminarId must be comma-separated ids and from/to dates YYYY-MM-DD'}), 400
 
-    excel_file = export_attendance_to_excel(seminar, registered_members, attendance_records)
+    output = write_attendance_history(export_format, attendance_history_query(seminar_ids, start, end))
 
     return send_file(
-        excel_file,
-        mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+        output,
+        mimetype=EXPORT_FORMATS[export_format],
         as_attachment=True,
-        download_name=f'{seminar.title}_attendance.xlsx'
+        download_name=f'attendance_history.{export_format}'
     )
@@ -1,20 +1,20 @@
 from flask import Blueprint, request, jsonify
 from app.models import Member
 from app.schemas import MemberSchema
-from app.db import db
+from app.db import db, read_replica
 from app.middleware import require_admin
 from app.utils.csv_import import parse_members_file
+from app.utils.responses import list_response
 from marshmallow import ValidationError
 from sqlalchemy.exc import IntegrityError
 
 bp = Blueprint('members', __name__)
 member_schema = MemberSchema()
-members_schema = MemberSchema(many=True)
 
 @bp.route('/api/members', methods=['GET'])
+@read_replica
 def get_members():
-    members = Member.query.all()
-    return jsonify(members_schema.dump(members)), 200
+    return list_response([Member.query], member_schema)
 
 @bp.route('/api/members', methods=['POST'])
 @require_admin
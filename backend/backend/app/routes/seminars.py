@@ -1,8 +1,10 @@
 from flask import Blueprint, request, jsonify
 from app.models import Seminar, Member
 from app.schemas import SeminarSchema
-from app.db import db
+from app.db import db, read_replica
 from app.middleware import require_admin
+from app.utils.archive import is_archived, archive_seminar, restore_seminar, snapshot_matrix
+from app.utils.attendance_index import get_index, record_attendance, invalidate_index, bitset_member_ids
 from marshmallow import ValidationError
 
 bp = Blueprint('seminars', __name__)
@@ -10,11 +12,13 @@ seminar_schema = SeminarSchema()
 seminars_schema = SeminarSchema(many=True)
 
 @bp.route('/api/seminars', methods=['GET'])
+@read_replica
 def get_seminars():
     seminars = Seminar.query.all()
     return jsonify(seminars_schema.dump(seminars)), 200
 
 @bp.route('/api/seminars/<int:id>', methods=['GET'])
+@read_replica
 def get_seminar(id):
     seminar = Seminar.query.get_or_404(id)
     return jsonify(seminar_schema.dump(seminar)), 200
@@ -46,22 +50,41 @@ def update_seminar(id):
     except ValidationError as err:
         return jsonify({'errors': err.messages}), 400
 
+    was_archived = is_archived(seminar)
+
     for key, value in data.items():
         setattr(seminar, key, value)
 
+    # Closing a seminar moves its attendance out of the hot table; reopening brings it back
+    if is_archived(seminar) and not was_archived:
+        archive_seminar(seminar)
+    elif was_archived and not is_archived(seminar):
+        restore_seminar(seminar)
+
     db.session.commit()
+
+    if is_archived(seminar) != was_archived:
+        invalidate_index(id)
+
     return jsonify(seminar_schema.dump(seminar)), 200
 
 @bp.route('/api/seminars/<int:id>/register', methods=['GET'])
+@read_replica
 def get_registered_members(id):
     from app.schemas import MemberSchema
-    from app.models import Attendance
+    from app.models import Attendance, AttendanceSnapshot
 
-    Seminar.query.get_or_404(id)
+    seminar = Seminar.query.get_or_404(id)
     member_schema = MemberSchema(many=True)
 
-    member_ids = db.session.query(Attendance.member_id).filter(Attendance.seminar_id == id).distinct().all()
-    members = Member.query.filter(Member.id.in_([m[0] for m in member_ids if m[0]])).all()
+    if is_archived(seminar):
+        snapshot = AttendanceSnapshot.query.get(id)
+        member_ids = [member.id for member, _ in snapshot_matrix(snapshot)] if snapshot else []
+    else:
+        member_ids = db.session.query(Attendance.member_id).filter(Attendance.seminar_id == id).distinct().all()
+        member_ids = [m[0] for m in member_ids if m[0]]
+
+    members = Member.query.filter(Member.id.in_(member_ids)).all()
 
     return jsonify(member_schema.dump(members)), 200
 
@@ -71,6 +94,8 @@ def register_member(id):
     from app.models import Attendance
 
     seminar = Seminar.query.get_or_404(id)
+    if is_archived(seminar):
+        return jsonify({'error': 'Seminar is closed'}), 409
 
     data = request.json
     member_id = data.get('memberId')
@@ -98,5 +123,41 @@ def register_member(id):
             db.session.add(attendance)
 
     db.session.commit()
+    record_attendance(id, member.id, range(1, seminar.number_of_days + 1))
 
     return jsonify({'message': 'Member registered successfully'}), 200
+
+def parse_days(value):
+    if not value:
+        return []
+    return [int(day) for day in value.split(',')]
+
+# Not @read_replica: the index is built from these reads and then cached, so it must not start out behind
+@bp.route('/api/seminars/<int:id>/attendance/query', methods=['GET'])
+def query_attendance(id):
+    from app.schemas import MemberSchema
+
+    seminar = Seminar.query.get_or_404(id)
+
+    try:
+        all_days = parse_days(request.args.get('all'))
+        any_days = parse_days(request.args.get('any'))
+        none_days = parse_days(request.args.get('none'))
+        page = request.args.get('page', type=int)
+        per_page = min(request.args.get('perPage', 50, type=int), 500)
+    except ValueError:
+        return jsonify({'error': 'Days must be comma-separated integers'}), 400
+
+    result = get_index(seminar).query(all_days, any_days, none_days)
+    response = {'count': result.bit_count()}
+
+    if page:
+        ids = bitset_member_ids(result, offset=(page - 1) * per_page, limit=per_page)
+        members = Member.query.filter(Member.id.in_(ids)).order_by(Member.id).all() if ids else []
+        response.update({
+            'page': page,
+            'perPage': per_page,
+            'members': MemberSchema(many=True).dump(members),
+        })
+
+    return jsonify(response), 200
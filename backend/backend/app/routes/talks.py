@@ -1,7 +1,7 @@
 from flask import Blueprint, request, jsonify
 from app.models import Talk, Comment
 from app.schemas import TalkSchema, CommentSchema
-from app.db import db
+from app.db import db, read_replica
 from app.middleware import require_admin
 from app.utils.file_upload import upload_file
 from marshmallow import ValidationError
@@ -35,6 +35,7 @@ def create_talk():
     return jsonify(talk_schema.dump(talk)), 201
 
 @bp.route('/api/talks/<int:id>', methods=['GET'])
+@read_replica
 def get_talk(id):
     talk = Talk.query.get_or_404(id)
     return jsonify(talk_schema.dump(talk)), 200
@@ -82,6 +83,7 @@ def create_comment(id):
     return jsonify(comment_schema.dump(comment)), 201
 
 @bp.route('/api/talks/<int:id>/comments', methods=['GET'])
+@read_replica
 def get_comments(id):
     talk = Talk.query.get_or_404(id)
     comments = Comment.query.filter_by(talk_id=id).order_by(Comment.created_at.asc()).all()
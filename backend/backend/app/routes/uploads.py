@@ -0,0 +1,34 @@
+import mimetypes
+import os
+from flask import Blueprint, Response, abort, send_from_directory
+from werkzeug.security import safe_join
+from app.utils.file_upload import UPLOAD_FOLDER
+
+bp = Blueprint('uploads', __name__)
+
+# Upload filenames are timestamp-prefixed, so a given URL never changes content
+UPLOAD_MAX_AGE = 365 * 24 * 60 * 60
+UPLOAD_CACHE_CONTROL = f'public, max-age={UPLOAD_MAX_AGE}, immutable'
+
+@bp.route('/uploads/<path:filename>', methods=['GET'])
+def get_upload(filename):
+    upload_dir = os.path.abspath(UPLOAD_FOLDER)
+    path = safe_join(upload_dir, filename)
+
+    if path is None or not os.path.isfile(path):
+        abort(404)
+
+    # Behind nginx, hand the transfer (sendfile, Range, ETag) to an internal location
+    accel_prefix = os.getenv('UPLOADS_ACCEL_REDIRECT')
+    if accel_prefix:
+        response = Response(mimetype=mimetypes.guess_type(filename)[0] or 'application/octet-stream')
+        response.headers['X-Accel-Redirect'] = f'{accel_prefix.rstrip("/")}/{filename}'
+        response.headers['Cache-Control'] = UPLOAD_CACHE_CONTROL
+        return response
+
+    # Otherwise Werkzeug answers Range and If-None-Match itself and hands the file to the
+    # server's wsgi.file_wrapper, which gunicorn sends with sendfile()
+    response = send_from_directory(upload_dir, filename, conditional=True, etag=True, max_age=UPLOAD_MAX_AGE)
+    response.headers['Cache-Control'] = UPLOAD_CACHE_CONTROL
+    response.headers['Accept-Ranges'] = 'bytes'
+    return response
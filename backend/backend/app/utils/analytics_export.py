@@ -0,0 +1,79 @@
+import tempfile
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.ipc as pa_ipc
+import pyarrow.parquet as pq
+from sqlalchemy import select, union_all
+from app.db import db
+from app.models import Attendance, AttendanceArchive, Member, Seminar
+
+BATCH_SIZE = 50000
+
+EXPORT_FORMATS = {
+    'parquet': 'application/vnd.apache.parquet',
+    'arrow': 'application/vnd.apache.arrow.file',
+    'csv': 'text/csv',
+}
+
+HISTORY_SCHEMA = pa.schema([
+    ('pf_number', pa.string()),
+    ('first_name', pa.string()),
+    ('last_name', pa.string()),
+    ('department', pa.string()),
+    ('seminar_id', pa.int32()),
+    ('seminar_title', pa.string()),
+    ('day', pa.int16()),
+    ('signed_in_at', pa.timestamp('us')),
+])
+
+def attendance_history_query(seminar_ids=None, start=None, end=None):
+    """Long-form attendance across live and archived seminars, one row per member per day."""
+    selects = []
+    for model in (Attendance, AttendanceArchive):
+        query = select(
+            Member.pf_number,
+            Member.first_name,
+            Member.last_name,
+            Member.department,
+            model.seminar_id,
+            Seminar.title,
+            model.day,
+            model.created_at,
+        ).join(Member, Member.id == model.member_id).join(Seminar, Seminar.id == model.seminar_id)
+
+        if seminar_ids:
+            query = query.where(model.seminar_id.in_(seminar_ids))
+
+        if start:
+            query = query.where(model.created_at >= start)
+
+        if end:
+            query = query.where(model.created_at < end)
+
+        selects.append(query)
+
+    return union_all(*selects)
+
+def open_writer(export_format, output):
+    if export_format == 'parquet':
+        return pq.ParquetWriter(output, HISTORY_SCHEMA, compression='zstd')
+    if export_format == 'arrow':
+        return pa_ipc.new_file(output, HISTORY_SCHEMA)
+    return pa_csv.CSVWriter(output, HISTORY_SCHEMA)
+
+def write_attendance_history(export_format, query):
+    """Stream query rows through record batches into a temporary file, keeping memory bounded by BATCH_SIZE."""
+    output = tempfile.TemporaryFile()
+    writer = open_writer(export_format, output)
+
+    result = db.session.execute(query, execution_options={'stream_results': True, 'yield_per': BATCH_SIZE})
+    for rows in result.partitions():
+        columns = zip(*rows)
+        writer.write_batch(pa.RecordBatch.from_arrays(
+            [pa.array(column, type=field.type) for column, field in zip(columns, HISTORY_SCHEMA)],
+            schema=HISTORY_SCHEMA
+        ))
+
+    writer.close()
+    output.seek(0)
+    return output
@@ -0,0 +1,69 @@
+import json
+import zlib
+from collections import namedtuple
+from sqlalchemy import select
+from app.db import db
+from app.models import Attendance, AttendanceArchive, AttendanceSnapshot, Member
+
+ARCHIVED_STATUS = 'closed'
+ATTENDANCE_COLUMNS = ['id', 'seminar_id', 'day', 'member_id', 'created_at', 'ip_address', 'location']
+
+SnapshotMember = namedtuple('SnapshotMember', ['id', 'pf_number', 'first_name', 'last_name', 'department', 'phone_number'])
+
+def is_archived(seminar):
+    return seminar.status == ARCHIVED_STATUS
+
+def attendance_model_for(seminar):
+    return AttendanceArchive if is_archived(seminar) else Attendance
+
+def build_snapshot(seminar):
+    """Freeze the seminar's attendance matrix: one row per registered member with a bitmask of attended days."""
+    days_by_member = {}
+    rows = db.session.query(Attendance.member_id, Attendance.day).filter(Attendance.seminar_id == seminar.id)
+    for member_id, day in rows:
+        # Rows outside the seminar's days keep the member registered but can't go in the matrix
+        days_by_member.setdefault(member_id, 0)
+        if 1 <= day <= seminar.number_of_days:
+            days_by_member[member_id] |= 1 << (day - 1)
+
+    members = Member.query.filter(Member.id.in_(days_by_member)).all() if days_by_member else []
+    payload = [
+        [m.id, m.pf_number, m.first_name, m.last_name, m.department, m.phone_number, days_by_member[m.id]]
+        for m in members
+    ]
+
+    return AttendanceSnapshot(
+        seminar_id=seminar.id,
+        number_of_days=seminar.number_of_days,
+        member_count=len(payload),
+        data=zlib.compress(json.dumps(payload, separators=(',', ':')).encode('utf-8')),
+    )
+
+def snapshot_matrix(snapshot):
+    """Decode a snapshot into (member, attended days) pairs."""
+    matrix = []
+    for *member, days_mask in json.loads(zlib.decompress(snapshot.data)):
+        days = {day for day in range(1, snapshot.number_of_days + 1) if days_mask & (1 << (day - 1))}
+        matrix.append((SnapshotMember(*member), days))
+    return matrix
+
+def archive_seminar(seminar):
+    """Snapshot a closed seminar and move its rows from attendances into attendance_archive. Caller commits."""
+    db.session.merge(build_snapshot(seminar))
+
+    attendances = Attendance.__table__
+    db.session.execute(AttendanceArchive.__table__.insert().from_select(
+        ATTENDANCE_COLUMNS,
+        select(*[attendances.c[column] for column in ATTENDANCE_COLUMNS]).where(attendances.c.seminar_id == seminar.id)
+    ))
+    db.session.execute(attendances.delete().where(attendances.c.seminar_id == seminar.id))
+
+def restore_seminar(seminar):
+    """Move a reopened seminar's rows back into attendances and drop its snapshot. Caller commits."""
+    archive = AttendanceArchive.__table__
+    db.session.execute(Attendance.__table__.insert().from_select(
+        ATTENDANCE_COLUMNS,
+        select(*[archive.c[column] for column in ATTENDANCE_COLUMNS]).where(archive.c.seminar_id == seminar.id)
+    ))
+    db.session.execute(archive.delete().where(archive.c.seminar_id == seminar.id))
+    AttendanceSnapshot.query.filter_by(seminar_id=seminar.id).delete()
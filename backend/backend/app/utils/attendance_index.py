@@ -0,0 +1,116 @@
+import threading
+import time
+from flask import current_app
+from app.db import db
+from app.models import AttendanceSnapshot
+from app.utils.archive import is_archived, attendance_model_for, snapshot_matrix
+
+class AttendanceIndex:
+    """Per-seminar bitsets over member IDs: one per day, plus one for everyone registered."""
+
+    def __init__(self, frozen=False):
+        self.days = {}
+        self.registered = 0
+        self.frozen = frozen
+        self.built_at = time.monotonic()
+
+    def add(self, member_id, day):
+        bit = 1 << member_id
+        self.days[day] = self.days.get(day, 0) | bit
+        self.registered |= bit
+
+    def day(self, day):
+        return self.days.get(day, 0)
+
+    def query(self, all_days=(), any_days=(), none_days=()):
+        """Registered members who attended all of all_days, at least one of any_days and none of none_days."""
+        result = self.registered
+
+        for day in all_days:
+            result &= self.day(day)
+
+        if any_days:
+            attended_any = 0
+            for day in any_days:
+                attended_any |= self.day(day)
+            result &= attended_any
+
+        for day in none_days:
+            result &= ~self.day(day)
+
+        return result
+
+    def expired(self, ttl):
+        return not self.frozen and time.monotonic() - self.built_at > ttl
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+_seminar_locks = {}
+
+def seminar_lock(seminar_id):
+    """Serializes builds and updates of one seminar's index, so a sign-in can't land on an index being replaced."""
+    with _indexes_lock:
+        return _seminar_locks.setdefault(seminar_id, threading.Lock())
+
+def build_index(seminar):
+    if is_archived(seminar):
+        index = AttendanceIndex(frozen=True)
+        snapshot = AttendanceSnapshot.query.get(seminar.id)
+        for member, days in snapshot_matrix(snapshot) if snapshot else []:
+            for day in days:
+                index.add(member.id, day)
+            index.registered |= 1 << member.id
+        return index
+
+    model = attendance_model_for(seminar)
+    index = AttendanceIndex()
+    rows = db.session.query(model.member_id, model.day).filter(model.seminar_id == seminar.id)
+    for member_id, day in rows:
+        index.add(member_id, day)
+    return index
+
+def is_stale(index, seminar):
+    # Another worker may have closed or reopened the seminar since this index was built
+    # Each worker keeps its own index; sign-ins handled by other workers show up after a rebuild
+    return (
+        index is None
+        or index.expired(current_app.config['ATTENDANCE_INDEX_TTL'])
+        or index.frozen != is_archived(seminar)
+    )
+
+def get_index(seminar):
+    index = _indexes.get(seminar.id)
+    if not is_stale(index, seminar):
+        return index
+
+    with seminar_lock(seminar.id):
+        index = _indexes.get(seminar.id)
+        if is_stale(index, seminar):
+            index = build_index(seminar)
+            _indexes[seminar.id] = index
+    return index
+
+def record_attendance(seminar_id, member_id, days):
+    """Keep a cached index current after attendance rows are committed."""
+    with seminar_lock(seminar_id):
+        index = _indexes.get(seminar_id)
+        if index is not None:
+            for day in days:
+                index.add(member_id, day)
+
+def invalidate_index(seminar_id):
+    with seminar_lock(seminar_id):
+        _indexes.pop(seminar_id, None)
+
+def bitset_member_ids(bitset, offset=0, limit=None):
+    """Member IDs set in bitset, in ascending order."""
+    ids = []
+    skipped = 0
+    while bitset and (limit is None or len(ids) < limit):
+        lowest = bitset & -bitset
+        if skipped < offset:
+            skipped += 1
+        else:
+            ids.append(lowest.bit_length() - 1)
+        bitset ^= lowest
+    return ids
@@ -39,9 +39,16 @@ def export_attendance_to_excel(seminar, registered_members, attendance_records):
             attendance_map[record.member_id] = set()
         attendance_map[record.member_id].add(record.day)
 
+    return attendance_matrix_to_excel(seminar.number_of_days, [
+        (member, attendance_map.get(member.id, set()))
+        for member in registered_members
+    ])
+
+def attendance_matrix_to_excel(number_of_days, matrix):
+    """Render (member, attended days) pairs as an XLSX attendance sheet."""
     # Build data rows
     data = []
-    for member in sorted(registered_members, key=lambda m: m.pf_number):
+    for member, member_attendance in sorted(matrix, key=lambda entry: entry[0].pf_number):
         row = {
             'PF Number': member.pf_number,
             'First Name': member.first_name,
@@ -51,8 +58,7 @@ def export_attendance_to_excel(seminar, registered_members, attendance_records):
         }
 
         # Add day columns
-        member_attendance = attendance_map.get(member.id, set())
-        for day in range(1, seminar.number_of_days + 1):
+        for day in range(1, number_of_days + 1):
             row[f'Day {day}'] = 'Yes' if day in member_attendance else 'No'
 
         data.append(row)
@@ -0,0 +1,137 @@
+import glob
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+from botocore.exceptions import ClientError
+from flask import current_app, send_file, redirect
+from sqlalchemy import func
+from app.db import db
+from app.models import Attendance, AttendanceSnapshot
+from app.utils.archive import is_archived
+from app.utils.file_upload import get_s3_client
+
+XLSX_MIMETYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+EXPORT_CACHE_DIR = os.getenv('EXPORT_CACHE_DIR', 'cache/exports')
+EXPORT_CACHE_MAX_BYTES = int(os.getenv('EXPORT_CACHE_MAX_BYTES', 500 * 1024 * 1024))
+S3_PRESIGNED_EXPIRY = 300
+
+_evict_lock = threading.Lock()
+
+def use_s3():
+    return os.getenv('FLASK_ENV', 'development') == 'production' and bool(os.getenv('S3_BUCKET'))
+
+def export_cache_key(seminar):
+    """Cache key that changes whenever the rendered workbook would."""
+    if is_archived(seminar):
+        snapshot = AttendanceSnapshot.query.get(seminar.id)
+        version = snapshot.created_at if snapshot else None
+    else:
+        version = db.session.query(
+            func.count(Attendance.id), func.max(Attendance.id), func.max(Attendance.created_at)
+        ).filter(Attendance.seminar_id == seminar.id).one()
+
+    fingerprint = f'{seminar.title}:{seminar.number_of_days}:{seminar.status}:{seminar.updated_at}:{version}'
+    return f'seminar-{seminar.id}-{hashlib.sha1(fingerprint.encode("utf-8")).hexdigest()[:16]}'
+
+def local_path(key):
+    return os.path.abspath(os.path.join(EXPORT_CACHE_DIR, f'{key}.xlsx'))
+
+def s3_key(key):
+    return f'exports/{key}.xlsx'
+
+def send_cached_export(key, download_name):
+    """Serve a cached workbook, or return None on a miss."""
+    if use_s3():
+        s3_client = get_s3_client()
+        try:
+            s3_client.head_object(Bucket=os.getenv('S3_BUCKET'), Key=s3_key(key))
+        except ClientError:
+            return None
+
+        url = s3_client.generate_presigned_url('get_object', Params={
+            'Bucket': os.getenv('S3_BUCKET'),
+            'Key': s3_key(key),
+            'ResponseContentDisposition': f'attachment; filename="{download_name}"',
+        }, ExpiresIn=S3_PRESIGNED_EXPIRY)
+        return redirect(url)
+
+    path = local_path(key)
+    try:
+        # Bump mtime so eviction treats it as recently used
+        os.utime(path)
+    except FileNotFoundError:
+        return None
+
+    return send_export(path, key, download_name)
+
+def send_export(file, key, download_name):
+    response = send_file(
+        file,
+        mimetype=XLSX_MIMETYPE,
+        as_attachment=True,
+        download_name=download_name,
+        etag=key,
+        conditional=True,
+        max_age=0
+    )
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+def store_export(key, excel_file):
+    """Cache a freshly rendered workbook, replacing older versions for the same seminar."""
+    if use_s3():
+        get_s3_client().upload_fileobj(excel_file, os.getenv('S3_BUCKET'), s3_key(key),
+                                       ExtraArgs={'ContentType': XLSX_MIMETYPE})
+        excel_file.seek(0)
+        return
+
+    os.makedirs(EXPORT_CACHE_DIR, exist_ok=True)
+
+    seminar_prefix = key.rsplit('-', 1)[0]
+    for stale in glob.glob(os.path.join(os.path.abspath(EXPORT_CACHE_DIR), f'{seminar_prefix}-*.xlsx')):
+        if stale != local_path(key):
+            remove_quietly(stale)
+
+    fd, tmp_path = tempfile.mkstemp(dir=EXPORT_CACHE_DIR, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as tmp:
+            shutil.copyfileobj(excel_file, tmp)
+        os.replace(tmp_path, local_path(key))
+    except OSError:
+        # evict() only sees *.xlsx, so a half-written temp file would never be cleaned up
+        remove_quietly(tmp_path)
+        current_app.logger.warning('Could not cache export %s', key, exc_info=True)
+        return
+    except BaseException:
+        remove_quietly(tmp_path)
+        raise
+    finally:
+        excel_file.seek(0)
+
+    evict()
+
+def evict():
+    """Drop least recently used workbooks until the cache fits in EXPORT_CACHE_MAX_BYTES."""
+    with _evict_lock:
+        entries = []
+        for path in glob.glob(os.path.join(EXPORT_CACHE_DIR, '*.xlsx')):
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= EXPORT_CACHE_MAX_BYTES:
+                break
+            remove_quietly(path)
+            total -= size
+
+def remove_quietly(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
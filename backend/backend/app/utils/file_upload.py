@@ -30,22 +30,26 @@ def upload_locally(file, filename):
     file.save(filepath)
     return f'/uploads/{filename}'
 
-def upload_to_s3(file, filename):
-    s3_bucket = os.getenv('S3_BUCKET')
+def get_s3_client():
     s3_region = os.getenv('S3_REGION', 'us-east-1')
     aws_access_key = os.getenv('AWS_ACCESS_KEY_ID')
     aws_secret_key = os.getenv('AWS_SECRET_ACCESS_KEY')
 
-    if not all([s3_bucket, aws_access_key, aws_secret_key]):
+    if not all([os.getenv('S3_BUCKET'), aws_access_key, aws_secret_key]):
         raise ValueError('S3 configuration incomplete')
 
-    s3_client = boto3.client(
+    return boto3.client(
         's3',
         region_name=s3_region,
         aws_access_key_id=aws_access_key,
         aws_secret_access_key=aws_secret_key
     )
 
+def upload_to_s3(file, filename):
+    s3_bucket = os.getenv('S3_BUCKET')
+    s3_region = os.getenv('S3_REGION', 'us-east-1')
+    s3_client = get_s3_client()
+
     s3_key = f'presentations/{filename}'
 
     s3_client.upload_fileobj(
@@ -0,0 +1,82 @@
+import gzip
+import json
+import zlib
+from itertools import chain
+from flask import Response, current_app, request, jsonify, stream_with_context
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+STREAM_BATCH_SIZE = 1000
+
+def wants_ndjson():
+    return request.accept_mimetypes.best_match(['application/json', NDJSON_MIMETYPE]) == NDJSON_MIMETYPE
+
+def negotiate_encoding():
+    encodings = ['br', 'gzip'] if brotli else ['gzip']
+    return request.accept_encodings.best_match(encodings)
+
+def compress_response(response):
+    """Compress a buffered response body if the client accepts it and it is worth it."""
+    encoding = negotiate_encoding()
+    if not encoding or response.direct_passthrough or 'Content-Encoding' in response.headers:
+        return response
+
+    response.vary.add('Accept-Encoding')
+    data = response.get_data()
+    if len(data) < current_app.config['COMPRESSION_MIN_SIZE']:
+        return response
+
+    if encoding == 'br':
+        response.set_data(brotli.compress(data, quality=5))
+    else:
+        response.set_data(gzip.compress(data, compresslevel=6))
+    response.headers['Content-Encoding'] = encoding
+    return response
+
+def compress_stream(chunks, encoding):
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=5)
+        for chunk in chunks:
+            yield compressor.process(chunk) + compressor.flush()
+        yield compressor.finish()
+    else:
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        for chunk in chunks:
+            yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        yield compressor.flush()
+
+def ndjson_response(queries, schema):
+    """Stream one JSON object per line, reading rows from a server-side cursor in batches."""
+    def generate():
+        rows = chain.from_iterable(query.yield_per(STREAM_BATCH_SIZE) for query in queries)
+        batch = []
+        for row in rows:
+            batch.append(json.dumps(schema.dump(row), default=str))
+            if len(batch) == STREAM_BATCH_SIZE:
+                yield ('\n'.join(batch) + '\n').encode('utf-8')
+                batch = []
+        if batch:
+            yield ('\n'.join(batch) + '\n').encode('utf-8')
+
+    chunks = generate()
+    encoding = negotiate_encoding()
+    if encoding:
+        chunks = compress_stream(chunks, encoding)
+
+    response = Response(stream_with_context(chunks), mimetype=NDJSON_MIMETYPE)
+    response.vary.add('Accept-Encoding')
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    return response
+
+def list_response(queries, schema):
+    """Serve query results as NDJSON when asked for, otherwise as a (compressed) JSON array."""
+    if wants_ndjson():
+        return ndjson_response(queries, schema)
+
+    records = [row for query in queries for row in query.all()]
+    return compress_response(jsonify(schema.dump(records, many=True)))
@@ -0,0 +1,45 @@
+#!/usr/bin/env python
+"""Cold vs. warm timing of GET /api/attendance/export.
+
+Usage: python benchmark_export_cache.py <seminar_id> [runs]
+"""
+import os
+import shutil
+import sys
+import time
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from app import create_app
+from app.utils.export_cache import EXPORT_CACHE_DIR
+
+seminar_id = sys.argv[1]
+runs = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+
+app = create_app()
+client = app.test_client()
+headers = {'x-admin-token': os.getenv('ADMIN_TOKEN', '')}
+url = f'/api/attendance/export?seminarId={seminar_id}'
+
+def timed(extra_headers=None):
+    start = time.perf_counter()
+    response = client.get(url, headers={**headers, **(extra_headers or {})})
+    elapsed = (time.perf_counter() - start) * 1000
+    if response.status_code not in (200, 304):
+        sys.exit(f'Export failed with {response.status_code}: {response.get_data(as_text=True)}')
+    return elapsed, response
+
+cold = []
+for _ in range(runs):
+    shutil.rmtree(EXPORT_CACHE_DIR, ignore_errors=True)
+    cold.append(timed()[0])
+
+warm = [timed()[0] for _ in range(runs)]
+
+etag = timed()[1].headers['ETag']
+not_modified = [timed({'If-None-Match': etag})[0] for _ in range(runs)]
+
+for label, timings in [('cold (render)', cold), ('warm (cached file)', warm), ('warm (304 via ETag)', not_modified)]:
+    timings.sort()
+    print(f'{label:22} median {timings[len(timings) // 2]:8.2f} ms   min {timings[0]:8.2f} ms')
@@ -1,2 +1,22 @@
+"""Add start_date to seminars
 
-3
+Revision ID: 002
+Revises: 001
+Create Date: 2025-10-06 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '002'
+down_revision = '001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('seminars', sa.Column('start_date', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('seminars', 'start_date')
@@ -0,0 +1,49 @@
+"""Attendance archive and snapshots for closed seminars
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_attendances_seminar_day', 'attendances', ['seminar_id', 'day'])
+
+    op.create_table('attendance_archive',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('seminar_id', sa.Integer(), nullable=False),
+        sa.Column('day', sa.Integer(), nullable=False),
+        sa.Column('member_id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('ip_address', sa.String(length=45), nullable=True),
+        sa.Column('location', sa.String(length=255), nullable=True),
+        sa.ForeignKeyConstraint(['member_id'], ['members.id'], ),
+        sa.ForeignKeyConstraint(['seminar_id'], ['seminars.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_attendance_archive_seminar_id', 'attendance_archive', ['seminar_id'])
+
+    op.create_table('attendance_snapshots',
+        sa.Column('seminar_id', sa.Integer(), nullable=False),
+        sa.Column('number_of_days', sa.Integer(), nullable=False),
+        sa.Column('member_count', sa.Integer(), nullable=False),
+        sa.Column('data', sa.LargeBinary(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['seminar_id'], ['seminars.id'], ),
+        sa.PrimaryKeyConstraint('seminar_id')
+    )
+
+
+def downgrade():
+    op.drop_table('attendance_snapshots')
+    op.drop_index('ix_attendance_archive_seminar_id', table_name='attendance_archive')
+    op.drop_table('attendance_archive')
+    op.drop_index('ix_attendances_seminar_day', table_name='attendances')
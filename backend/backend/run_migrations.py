@@ -1,16 +1,104 @@
 #!/usr/bin/env python
+"""Apply pending migrations on container start.
+
+Exits straight away when alembic_version already matches the migration heads. Otherwise a
+PostgreSQL advisory lock makes sure only one replica migrates; the others wait for it, re-check
+and skip.
+"""
 import os
-from flask import Flask
-from flask_migrate import upgrade
-from app.db import db, migrate
+import sys
+import time
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.pool import NullPool
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'migrations')
+# Arbitrary key shared by every replica
+MIGRATION_LOCK_ID = 4_207_201
+MIGRATION_LOCK_TIMEOUT = float(os.getenv('MIGRATION_LOCK_TIMEOUT', 120))
+
+started = time.perf_counter()
+
+def log(message):
+    print(f'[migrations +{(time.perf_counter() - started) * 1000:.0f}ms] {message}', flush=True)
+
+def head_revisions():
+    config = Config(os.path.join(MIGRATIONS_DIR, 'alembic.ini'))
+    config.set_main_option('script_location', MIGRATIONS_DIR)
+    return set(ScriptDirectory.from_config(config).get_heads())
+
+def current_revisions(connection):
+    if not inspect(connection).has_table('alembic_version'):
+        return set()
+    return {row[0] for row in connection.execute(text('SELECT version_num FROM alembic_version'))}
+
+def at_head(connection, heads):
+    current = current_revisions(connection)
+    connection.commit()
+    return current == heads
+
+def acquire_lock(connection):
+    deadline = time.monotonic() + MIGRATION_LOCK_TIMEOUT
+    while True:
+        if connection.execute(text('SELECT pg_try_advisory_lock(:id)'), {'id': MIGRATION_LOCK_ID}).scalar():
+            connection.commit()
+            return True
+        connection.commit()
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(0.5)
+
+def release_lock(connection):
+    connection.execute(text('SELECT pg_advisory_unlock(:id)'), {'id': MIGRATION_LOCK_ID})
+    connection.commit()
+
+def upgrade():
+    # Only pay for the Flask app and Flask-Migrate when there is something to apply
+    from flask import Flask
+    from flask_migrate import upgrade as flask_migrate_upgrade
+    from app.db import db, migrate
+
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URL')
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+
+    db.init_app(app)
+    migrate.init_app(app, db, directory=MIGRATIONS_DIR)
+
+    with app.app_context():
+        flask_migrate_upgrade()
+
+def main():
+    heads = head_revisions()
+    engine = create_engine(os.getenv('DATABASE_URL'), poolclass=NullPool)
+
+    with engine.connect() as connection:
+        if at_head(connection, heads):
+            log(f'Database already at head ({", ".join(sorted(heads))}), nothing to do')
+            return 0
+
+        if engine.dialect.name != 'postgresql':
+            upgrade()
+            log('Migrations applied successfully!')
+            return 0
+
+        log('Migrations pending, waiting for migration lock')
+        if not acquire_lock(connection):
+            log(f'Timed out after {MIGRATION_LOCK_TIMEOUT:.0f}s waiting for another replica to migrate')
+            return 1
 
-app = Flask(__name__)
-app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URL')
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+        try:
+            if at_head(connection, heads):
+                log('Another replica applied the migrations, skipping')
+                return 0
 
-db.init_app(app)
-migrate.init_app(app, db)
+            log('Migration lock acquired, applying migrations')
+            upgrade()
+            log('Migrations applied successfully!')
+            return 0
+        finally:
+            release_lock(connection)
 
-with app.app_context():
-    upgrade()
-    print("Migrations applied successfully!")
+if __name__ == '__main__':
+    sys.exit(main())
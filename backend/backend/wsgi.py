@@ -1,9 +1,10 @@
-from app import create_app
 from dotenv import load_dotenv
 import os
 
 load_dotenv()
 
+from app import create_app
+
 app = create_app()
 
 if __name__ == '__main__':